@@ -1,7 +1,10 @@
+import numpy as np
 import pandas as pd
+from indicators.context import IndicatorContext
+from indicators.primitives import wilder_smoothing, wilder_sum
 
 
-def average_directional_index(df):
+def average_directional_index(df, period=14, ctx=None):
     """
     True Range(TR) is max of
         -Current High less the current Low
@@ -29,72 +32,35 @@ def average_directional_index(df):
     Subsequent ADX14 = ((Prior ADX14 x 13) + Current DX Value)/14
     """
 
-    df1 = df.copy()
-    pd.set_option("chained_assignment", None)
-    Low = df["Low"]
-    High = df["High"]
-    Close = df["Close"]
+    ctx = ctx if ctx is not None else IndicatorContext(df)
 
     # Calculation Of True Range
-    a = High - Low
-    b = abs(High - Close.shift(1))
-    c = abs(Low - Close.shift(1))
-    d = round(a.clip(lower=b, axis=0), 3)
-    TR = round(d.clip(lower=c, axis=0), 3)
-    df["TR"] = TR
-
-    # Calculation of Pos DM
-    a = High - High.shift(1)
-    b = Low.shift(1) - Low
-    pos_DM1 = pd.Series([max(a[i], 0) if a[i] > b[i] else 0 for i in range(len(a))])
-    pos_DM1 = round(pos_DM1, 3)
-    df["pos_DM1"] = pos_DM1
-
-    # Calculation of Neg DM
-    neg_DM1 = pd.Series([max(b[i], 0) if b[i] > a[i] else 0 for i in range(len(a))])
-    neg_DM1 = round(neg_DM1, 3)
-    df["neg_DM1"] = neg_DM1
-
-    # TR14 Calculation
-    df["TR14"] = pd.Series()
-    df["TR14"].iloc[14] = df["TR"][:15].sum()
-
-    for i in range(15, len(df)):
-        df["TR14"][i] = df["TR14"][i - 1] - (df["TR14"][i - 1] / 14) + df["TR"][i]
-
-    # Calculation of Positive DM14 as well as Negative DM14
-    df["pos_DM14"] = pd.Series()
-    df["pos_DM14"].iloc[14] = df["pos_DM1"][:15].sum()
-
-    for i in range(15, len(df)):
-        df["pos_DM14"][i] = (
-            df["pos_DM14"][i - 1] - (df["pos_DM14"][i - 1] / 14) + df["pos_DM1"][i]
-        )
-
-    df["neg_DM14"] = pd.Series()
-    df["neg_DM14"].iloc[14] = df["neg_DM1"][:15].sum()
-
-    for i in range(15, len(df)):
-        df["neg_DM14"][i] = (
-            df["neg_DM14"][i - 1] - (df["neg_DM14"][i - 1] / 14) + df["neg_DM1"][i]
-        )
+    TR = round(ctx.true_range(), 3)
 
-    # DI Calculation
-    df["pos_DI14"] = df["pos_DM14"] / df["TR14"] * 100
-    df["neg_DI14"] = df["neg_DM14"] / df["TR14"] * 100
+    # Calculation of Pos DM and Neg DM
+    a = ctx.diff("High")
+    b = -ctx.diff("Low")
+    pos_DM1 = round(pd.Series(np.where(a > b, a.clip(lower=0), 0), index=df.index), 3)
+    neg_DM1 = round(pd.Series(np.where(b > a, b.clip(lower=0), 0), index=df.index), 3)
+
+    # TR14, positive DM14 and negative DM14 Calculation
+    TR14 = wilder_sum(TR, period, start=period)
+    pos_DM14 = wilder_sum(pos_DM1, period, start=period)
+    neg_DM14 = wilder_sum(neg_DM1, period, start=period)
 
-    df["DI 14 Diff"] = abs(df["pos_DI14"] - df["neg_DI14"])
-    df["DI 14 Sum"] = abs(df["pos_DI14"] + df["neg_DI14"])
+    # DI Calculation
+    pos_DI14 = pos_DM14 / TR14 * 100
+    neg_DI14 = neg_DM14 / TR14 * 100
 
     # DX Calculation
-    df["DX"] = df["DI 14 Diff"] / df["DI 14 Sum"] * 100
+    DX = abs(pos_DI14 - neg_DI14) / abs(pos_DI14 + neg_DI14) * 100
 
     # ADX Calculation
-    df["ADX"] = pd.Series()
-    df["ADX"].iloc[27] = df["DX"].iloc[13:27].mean()
-
-    for i in range(28, len(df)):
-        df["ADX"][i] = (df["ADX"][i - 1] * 13 + df["DX"][i]) / 14
+    adx_start = 2 * period - 1
+    ADX = wilder_smoothing(
+        DX, period, start=adx_start, seed=DX.iloc[period - 1 : adx_start].mean()
+    )
 
-    df1["ADX"] = df["ADX"]
-    return df1
\ No newline at end of file
+    df1 = df.copy()
+    df1["ADX"] = ADX
+    return df1
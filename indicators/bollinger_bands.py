@@ -1,15 +1,16 @@
-import pandas as pd
-import numpy as np
+from indicators.context import IndicatorContext
+from indicators.primitives import rolling_mean, rolling_std
 
 
-def bollinger_bands(df, period=20, extra=False):
+def bollinger_bands(df, period=20, extra=False, ctx=None):
     """
     Main Function To Be Called To Get All the Values Of Bollinger Bands
     """
 
-    df["BB_LOWER"] = lower_bollinger_band(df.Close, period)
-    df["BB_MIDDLE"] = middle_bollinger_band(df.Close, period)
-    df["BB_UPPER"] = upper_bollinger_band(df.Close, period)
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    df["BB_LOWER"] = lower_bollinger_band(df.Close, period, ctx=ctx)
+    df["BB_MIDDLE"] = middle_bollinger_band(df.Close, period, ctx=ctx)
+    df["BB_UPPER"] = upper_bollinger_band(df.Close, period, ctx=ctx)
 
     if extra:
         df["bandwidth"] = bandwidth(df)
@@ -19,7 +20,22 @@ def bollinger_bands(df, period=20, extra=False):
     return df
 
 
-def upper_bollinger_band(data, period, std_mult=2.0):
+def _sma(data, period, ctx=None):
+    # The context cache is used only when data is one of its frame's columns
+    column = ctx.source_column(data) if ctx is not None else None
+    if column is None:
+        return rolling_mean(data, period)
+    return ctx.rolling_mean(column, period)
+
+
+def _std(data, period, ctx=None):
+    column = ctx.source_column(data) if ctx is not None else None
+    if column is None:
+        return rolling_std(data, period)
+    return ctx.rolling_std(column, period)
+
+
+def upper_bollinger_band(data, period, std_mult=2.0, ctx=None):
     """
     Upper Bollinger Band.
 
@@ -28,20 +44,11 @@ def upper_bollinger_band(data, period, std_mult=2.0):
     """
 
     period = int(period)
-    simple_ma = data.rolling(window=period).mean()[period - 1 :]
-
-    upper_bb = []
-    for idx in range(len(data) - period + 1):
-        std_dev = np.std(data[idx : idx + period])
-        upper_bb.append(simple_ma.iloc[idx] + std_dev * std_mult)
-
-    non_computable_values = np.repeat(np.nan, len(data) - len(upper_bb))
-    upper_bb = np.append(non_computable_values, upper_bb)
-
-    return np.array(upper_bb)
+    upper_bb = _sma(data, period, ctx) + _std(data, period, ctx) * std_mult
+    return upper_bb.to_numpy()
 
 
-def middle_bollinger_band(data, period, std=2.0):
+def middle_bollinger_band(data, period, std=2.0, ctx=None):
     """
     Middle Bollinger Band.
 
@@ -50,12 +57,12 @@ def middle_bollinger_band(data, period, std=2.0):
     """
 
     period = int(period)
-    mid_bb = data.rolling(window=period).mean()
+    mid_bb = _sma(data, period, ctx)
 
     return mid_bb
 
 
-def lower_bollinger_band(data, period, std=2.0):
+def lower_bollinger_band(data, period, std=2.0, ctx=None):
     """
     Lower Bollinger Band.
 
@@ -64,15 +71,8 @@ def lower_bollinger_band(data, period, std=2.0):
     """
 
     period = int(period)
-    simple_ma = data.rolling(window=period).mean()[period - 1 :]
-    lower_bb = []
-    for idx in range(len(data) - period + 1):
-        std_dev = np.std(data[idx : idx + period])
-        lower_bb.append(simple_ma.iloc[idx] - std_dev * std)
-
-    non_computable_values = np.repeat(np.nan, len(data) - len(lower_bb))
-    lower_bb = np.append(non_computable_values, lower_bb)
-    return np.array(lower_bb)
+    lower_bb = _sma(data, period, ctx) - _std(data, period, ctx) * std
+    return lower_bb.to_numpy()
 
 
 def bandwidth(df):
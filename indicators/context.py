@@ -0,0 +1,100 @@
+import numpy as np
+
+from indicators.primitives import (
+    ema,
+    returns,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_std,
+    true_range,
+)
+
+
+class IndicatorContext:
+    """
+    Computation context for one OHLCV frame during a scoring pass.
+
+    Shared intermediates (shifted closes, rolling windows, EMAs, true range,
+    returns) are computed once and reused by every indicator that asks for
+    them. Values are cached by column name and never invalidated, so only
+    source columns (OHLCV) that stay fixed during the pass may be used;
+    derived columns such as RSI must be computed on directly.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+
+    def source_column(self, data):
+        """
+        Name of the column of df that data is, or None when data is another
+        series (a slice, a derived or unnamed series) the cache does not cover.
+        """
+        if data.name not in self.df.columns:
+            return None
+        column = self.df[data.name]
+        if (
+            len(data) != len(column)
+            or not np.shares_memory(data.to_numpy(), column.to_numpy())
+            or not data.index.equals(column.index)
+        ):
+            return None
+        return data.name
+
+    def _memo(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def shift(self, column, periods=1):
+        return self._memo(
+            ("shift", column, periods), lambda: self.df[column].shift(periods)
+        )
+
+    def diff(self, column, periods=1):
+        return self._memo(
+            ("diff", column, periods),
+            lambda: self.df[column] - self.shift(column, periods),
+        )
+
+    def returns(self, column="Close", periods=1):
+        return self._memo(
+            ("returns", column, periods), lambda: returns(self.df[column], periods)
+        )
+
+    def rolling_mean(self, column, window, min_periods=None):
+        return self._memo(
+            ("rolling_mean", column, window, min_periods),
+            lambda: rolling_mean(self.df[column], window, min_periods),
+        )
+
+    def rolling_std(self, column, window, ddof=0):
+        return self._memo(
+            ("rolling_std", column, window, ddof),
+            lambda: rolling_std(self.df[column], window, ddof),
+        )
+
+    def rolling_min(self, column, window):
+        return self._memo(
+            ("rolling_min", column, window),
+            lambda: rolling_min(self.df[column], window),
+        )
+
+    def rolling_max(self, column, window):
+        return self._memo(
+            ("rolling_max", column, window),
+            lambda: rolling_max(self.df[column], window),
+        )
+
+    def ema(self, column, span, min_periods=0):
+        return self._memo(
+            ("ema", column, span, min_periods),
+            lambda: ema(self.df[column], span, min_periods),
+        )
+
+    def true_range(self):
+        return self._memo(
+            ("true_range",),
+            lambda: true_range(self.df["High"], self.df["Low"], self.shift("Close")),
+        )
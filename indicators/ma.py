@@ -1,3 +1,7 @@
-def ma(df, period):
-    df["MA_" + str(period)] = df["Close"].rolling(window=period).mean()
+from indicators.context import IndicatorContext
+
+
+def ma(df, period, ctx=None):
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    df["MA_" + str(period)] = ctx.rolling_mean("Close", period)
     return df
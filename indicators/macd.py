@@ -1,19 +1,22 @@
 
 import pandas as pd
+from indicators.context import IndicatorContext
+from indicators.primitives import ema
 
 
-def macd(df, n_fast=12, n_slow=26, n_signal=9):
+def macd(df, n_fast=12, n_slow=26, n_signal=9, ctx=None):
     """
     MACD = 12 Period EMA - 26 Period EMA
     MACD Signal = 9 Period EMA of MACD
     MACD Hist = MACD-MACD signal
     """
-    EMAfast = pd.Series(df["Close"].ewm(span=n_fast, min_periods=n_slow).mean())
-    EMAslow = pd.Series(df["Close"].ewm(span=n_slow, min_periods=n_slow).mean())
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    EMAfast = ctx.ema("Close", span=n_fast, min_periods=n_slow)
+    EMAslow = ctx.ema("Close", span=n_slow, min_periods=n_slow)
 
     MACD = pd.Series(EMAfast - EMAslow, name="MACD")
     MACDsign = pd.Series(
-        MACD.ewm(span=n_signal, min_periods=n_signal).mean(), name="MACD_SIGN"
+        ema(MACD, span=n_signal, min_periods=n_signal), name="MACD_SIGN"
     )
     MACDdiff = pd.Series(MACD - MACDsign, name="MACD_HIST")
 
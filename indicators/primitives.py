@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+def rolling_mean(data, window, min_periods=None):
+    """
+    Simple moving average of data over window periods
+    """
+    return data.rolling(window=window, min_periods=min_periods).mean()
+
+
+def rolling_std(data, window, ddof=0):
+    """
+    Rolling standard deviation over window periods.
+    ddof=0 gives the population std (same as np.std)
+    """
+    return data.rolling(window=window).std(ddof=ddof)
+
+
+def rolling_min(data, window):
+    return data.rolling(window=window).min()
+
+
+def rolling_max(data, window):
+    return data.rolling(window=window).max()
+
+
+def ema(data, span, min_periods=0):
+    """
+    Exponential moving average with alpha = 2 / (span + 1)
+    """
+    return data.ewm(span=span, min_periods=min_periods).mean()
+
+
+def wilder_smoothing(data, period, start, seed):
+    """
+    Wilder smoothed moving average.
+
+    First Value = seed (at position start)
+    Subsequent Values = ((Prior Value x (period - 1)) + Current Value) / period
+
+    Values before start are NaN.
+    """
+    values = pd.Series(np.nan, index=data.index)
+    if len(data) <= start:
+        return values
+    values.iloc[start] = seed
+    values.iloc[start + 1 :] = data.iloc[start + 1 :]
+    return values.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def wilder_sum(data, period, start):
+    """
+    Wilder smoothed running sum.
+
+    First Value = Sum of data up to and including position start
+    Subsequent Values = Prior Value - (Prior Value / period) + Current Value
+    """
+    if len(data) <= start:
+        return pd.Series(np.nan, index=data.index)
+    seed = data.iloc[: start + 1].sum()
+    return wilder_smoothing(data * period, period, start, seed)
+
+
+def true_range(high, low, prev_close):
+    """
+    True Range(TR) is max of
+        -Current High less the current Low
+        -Current High less the previous Close (absolute value)
+        -Current Low less the previous Close (absolute value)
+    """
+    ranges = pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    )
+    return ranges.max(axis=1)
+
+
+def returns(data, periods=1):
+    """
+    Percentage change of data over periods
+    """
+    return data.pct_change(periods=periods)
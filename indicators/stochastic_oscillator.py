@@ -1,32 +1,34 @@
 import pandas as pd
+from indicators.context import IndicatorContext
+from indicators.primitives import rolling_mean
 
 
-def stochastic_fast(df, Kperiod=10, Dperiod=3):
+def stochastic_fast(df, Kperiod=10, Dperiod=3, ctx=None):
     """
     Fast K = (Current Close - Lowest Low)/(Highest High - Lowest Low) * 100
     Fast D = 3-day SMA of %K
     """
 
-    K = 100 * (
-        (df.Close - df.Low.rolling(window=Kperiod).min())
-        / (df.High.rolling(window=Kperiod).max() - df.Low.rolling(window=Kperiod).min())
-    )
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    lowest_low = ctx.rolling_min("Low", Kperiod)
+    highest_high = ctx.rolling_max("High", Kperiod)
+    K = 100 * ((df.Close - lowest_low) / (highest_high - lowest_low))
     df["STOCH_FAST_K"] = K
-    D = K.rolling(Dperiod).mean()
+    D = rolling_mean(K, Dperiod)
     df["STOCH_FAST_D"] = D
     return df
 
 
-def stochastic_slow(df, Kperiod=10, Dperiod=3):
+def stochastic_slow(df, Kperiod=10, Dperiod=3, ctx=None):
     """
     Slow K = Kperiod SMA of Fast K
     Slow D = Dperiod SMA of Slow K
     """
 
-    df = stochastic_fast(df)
+    df = stochastic_fast(df, ctx=ctx)
     K = df["STOCH_FAST_K"]
-    slowK = K.rolling(Kperiod).mean()
+    slowK = rolling_mean(K, Kperiod)
     df["STOCH_SLOW_K"] = slowK
-    slowD = slowK.rolling(Dperiod).mean()
+    slowD = rolling_mean(slowK, Dperiod)
     df["STOCH_SLOW_D"] = slowD
     return df
@@ -1,8 +1,8 @@
-import pandas as pd
-import numpy as np
+from indicators.context import IndicatorContext
+from indicators.primitives import rolling_max, rolling_mean, rolling_min, wilder_smoothing
 
 
-def relative_strength_index(df, period=14):
+def relative_strength_index(df, period=14, ctx=None):
     """
     Positive Change = Close - Prior Close if it is positive
     Negative Change = Close - Prior Close if it is negative
@@ -16,37 +16,36 @@ def relative_strength_index(df, period=14):
 
     """
 
-    change = df.Close - df.Close.shift(1)
-    pos_change = change.copy()
-    pos_change[pos_change < 0] = 0
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    change = ctx.diff("Close")
+    pos_change = change.clip(lower=0)
+    neg_change = abs(change.clip(upper=0))
 
-    neg_change = change.copy()
-    neg_change[neg_change > 0] = 0
-    neg_change = abs(neg_change)
+    avg_gain = rolling_mean(pos_change, period, min_periods=period - 1)
+    avg_loss = rolling_mean(neg_change, period, min_periods=period - 1)
 
-    avg_gain = pos_change.rolling(window=period, min_periods=period - 1).mean()
-    avg_loss = neg_change.rolling(window=period, min_periods=period - 1).mean()
-
-    for i in range(period + 1, len(df)):
-        avg_gain[i] = (avg_gain[i - 1] * (period - 1) + pos_change[i]) / period
-
-    for i in range(period + 1, len(df)):
-        avg_loss[i] = (avg_loss[i - 1] * (period - 1) + neg_change[i]) / period
-
-    RS = pd.Series(np.zeros(len(df)))
+    if len(df) > period:
+        avg_gain.iloc[period + 1 :] = wilder_smoothing(
+            pos_change, period, start=period, seed=avg_gain.iloc[period]
+        ).iloc[period + 1 :]
+        avg_loss.iloc[period + 1 :] = wilder_smoothing(
+            neg_change, period, start=period, seed=avg_loss.iloc[period]
+        ).iloc[period + 1 :]
 
     RS = (((avg_gain.shift(1) * (period - 1)) + pos_change) / period) / (
         ((avg_loss.shift(1) * (period - 1)) + neg_change) / period
     )
-    RS[period - 1] = avg_gain[period - 1] / avg_loss[period - 1]
+    if len(df) >= period:
+        RS.iloc[period - 1] = avg_gain.iloc[period - 1] / avg_loss.iloc[period - 1]
 
     df["RSI"] = 100 - (100 / (1 + RS))
     return df
 
 
-def stochastic_rsi(df, period=14, Kperiod=5, Dperiod=3):
+def stochastic_rsi(df, period=14, Kperiod=5, Dperiod=3, ctx=None):
     # Stochastic_Fast of RSi will give stochastic relative strength
-    df = stochastic_fast_rsi(relative_strength_index(df, period), Kperiod, Dperiod)
+    ctx = ctx if ctx is not None else IndicatorContext(df)
+    df = stochastic_fast_rsi(relative_strength_index(df, period, ctx=ctx), Kperiod, Dperiod)
 
     return df
 
@@ -58,11 +57,11 @@ def stochastic_fast_rsi(df, Kperiod=14, Dperiod=3):
     %D = 3-day SMA of %K
     """
 
-    K = 100 * (
-        (df.RSI - df.RSI.rolling(window=Kperiod).min())
-        / (df.RSI.rolling(window=Kperiod).max() - df.RSI.rolling(window=Kperiod).min())
-    )
+    # RSI is a derived column, so its windows are not cached in a context
+    lowest_rsi = rolling_min(df.RSI, Kperiod)
+    highest_rsi = rolling_max(df.RSI, Kperiod)
+    K = 100 * ((df.RSI - lowest_rsi) / (highest_rsi - lowest_rsi))
     df["RSI_FAST_K"] = K
-    D = K.rolling(Dperiod).mean()
+    D = rolling_mean(K, Dperiod)
     df["RSI_FAST_D"] = D
     return df
\ No newline at end of file
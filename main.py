@@ -7,7 +7,7 @@ import plotly.graph_objects as go
 import time
 from datetime import date
 from src.fundamental_score import calculate_fundamental_score
-from src.scores import calculate_stock_score
+from src.scores import calculate_stock_score, BUY_SCORE_THRESHOLD
 from src.get_data_for_scoring_yfinance import get_data
 st.sidebar.title("Navigation")
 menu_option = st.sidebar.selectbox("Select a section", ['Stock Score'])
@@ -24,5 +24,5 @@ if menu_option == 'Stock Score':
     text = f"Overall score of {query} is: {round(score, 2)}"
 
     st.header(f'{text}')
-    st.write(f' NOTE: A score greater than or equal to 0.5 indicates a favorable buying opportunity 📈')
-    st.write(f' NOTE: A score less than 0.5 indicates a favorable selling opportunity 📉')
+    st.write(f' NOTE: A score greater than or equal to {BUY_SCORE_THRESHOLD} indicates a favorable buying opportunity 📈')
+    st.write(f' NOTE: A score less than {BUY_SCORE_THRESHOLD} indicates a favorable selling opportunity 📉')
@@ -0,0 +1,108 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+META_FILE = "meta.json"
+DATES_FILE = "dates.npy"
+DATA_FILE = "ohlcv.dat"
+
+
+class OHLCVArchive:
+    """
+    On-disk OHLCV archive of many symbols over one shared date axis.
+
+    Values are stored in a single float64 NumPy memmap of shape
+    (symbols, fields, dates), so the bars of one symbol over a date range are
+    contiguous per field. Missing bars are NaN. Reads return views into the
+    memmap; only the pages touched are loaded from disk.
+    """
+
+    def __init__(self, path, mode="r"):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.symbols = meta["symbols"]
+        self.fields = meta["fields"]
+        self._symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        self.dates = np.load(os.path.join(path, DATES_FILE), mmap_mode="r")
+        self.data = np.memmap(
+            os.path.join(path, DATA_FILE),
+            dtype=np.float64,
+            mode=mode,
+            shape=(len(self.symbols), len(self.fields), len(self.dates)),
+        )
+
+    @classmethod
+    def create(cls, path, symbols, dates, fields=OHLCV_FIELDS):
+        """
+        Create an empty (all NaN) archive.
+        Args:
+            path (str): archive directory.
+            symbols (list): symbols stored in the archive.
+            dates (array-like): shared trading dates.
+            fields (list): stored fields, OHLCV by default.
+        Returns:
+            OHLCVArchive: archive opened for writing.
+        """
+        os.makedirs(path, exist_ok=True)
+        dates = np.asarray(pd.DatetimeIndex(dates).tz_localize(None), dtype="datetime64[D]")
+        np.save(os.path.join(path, DATES_FILE), dates)
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump({"symbols": list(symbols), "fields": list(fields)}, f)
+        data = np.memmap(
+            os.path.join(path, DATA_FILE),
+            dtype=np.float64,
+            mode="w+",
+            shape=(len(symbols), len(fields), len(dates)),
+        )
+        data[:] = np.nan
+        data.flush()
+        del data
+        return cls(path, mode="r+")
+
+    def write_symbol(self, symbol, history):
+        """
+        Store the bars of one symbol, aligned to the archive dates.
+        history is a frame with the archive fields as columns (e.g. yfinance history).
+        """
+        index = pd.DatetimeIndex(history.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        aligned = history.set_axis(index.normalize()).reindex(pd.DatetimeIndex(self.dates))
+        values = aligned.reindex(columns=self.fields).to_numpy(dtype=np.float64)
+        self.data[self._symbol_index[symbol]] = values.T
+
+    def flush(self):
+        self.data.flush()
+
+    def _date_slice(self, start=None, end=None):
+        # end is inclusive
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"))
+        hi = (
+            len(self.dates)
+            if end is None
+            else np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        )
+        return slice(lo, hi)
+
+    def window(self, symbol, start=None, end=None):
+        """
+        Zero-copy view of shape (fields, dates) for symbol between start and end.
+        """
+        return self.data[self._symbol_index[symbol], :, self._date_slice(start, end)]
+
+    def frame(self, symbol, start=None, end=None):
+        """
+        DataFrame over the window view (no copy), usable by the indicators/ functions.
+        """
+        dates = self._date_slice(start, end)
+        return pd.DataFrame(
+            self.window(symbol, start, end).T,
+            index=pd.DatetimeIndex(self.dates[dates]),
+            columns=self.fields,
+            copy=False,
+        )
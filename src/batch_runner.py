@@ -0,0 +1,281 @@
+import json
+import os
+import socket
+import time
+import uuid
+from multiprocessing import Pool
+
+from src.results import ResultWriter
+from src.scoring import is_transient_error, score_symbol
+from src.utils import to_json
+
+MANIFEST_FILE = "manifest.json"
+SHARDS_DIR = "shards"
+
+
+def create_run(run_dir, symbols, shard_size=50):
+    """
+    Create the manifest of a run, or load it if the run already exists.
+    Returns:
+        dict: manifest with the symbols and shard size of the run.
+    """
+    path = os.path.join(run_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest["symbols"] != list(symbols):
+            raise ValueError(f"{run_dir} holds a run for a different symbol list.")
+        return manifest
+
+    os.makedirs(os.path.join(run_dir, SHARDS_DIR), exist_ok=True)
+    manifest = {"symbols": list(symbols), "shard_size": shard_size}
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def load_manifest(run_dir):
+    with open(os.path.join(run_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def get_shards(manifest):
+    symbols, size = manifest["symbols"], manifest["shard_size"]
+    return [symbols[i : i + size] for i in range(0, len(symbols), size)]
+
+
+def _shard_path(run_dir, shard_id, suffix):
+    return os.path.join(run_dir, SHARDS_DIR, f"{shard_id:05d}.{suffix}")
+
+
+def _is_stale(lock_path, owner, lock_timeout):
+    # a lock is stale once its heartbeat is too old, or right away when its
+    # worker (owner, the token read from the lock) ran on this host and the
+    # process is gone
+    if time.time() - os.path.getmtime(lock_path) > lock_timeout:
+        return True
+    owner = owner.rsplit(":", 2)
+    if len(owner) != 3 or owner[0] != socket.gethostname():
+        # held on another machine
+        return False
+    host, pid, _ = owner
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def _remove_stale_lock(lock_path, lock_timeout):
+    # Checking and moving the lock are separate steps, so the lock may have been
+    # replaced by a fresh one in between. The moved file must still hold the
+    # token judged stale, otherwise it is put back; if a third worker claimed
+    # the shard meanwhile, the owner of the moved lock stops at its next heartbeat.
+    with open(lock_path) as f:
+        owner = f.read()
+    if not _is_stale(lock_path, owner, lock_timeout):
+        return
+    stale_path = f"{lock_path}.{uuid.uuid4().hex}.stale"
+    os.rename(lock_path, stale_path)
+    try:
+        with open(stale_path) as f:
+            if f.read() != owner:
+                os.link(stale_path, lock_path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(stale_path)
+
+
+def _claim_shard(run_dir, shard_id, lock_timeout):
+    """
+    Take the lock of a shard. The lock file is linked into place atomically
+    with its token already written, so only one worker (process or machine
+    sharing run_dir) gets it. A lock not refreshed within lock_timeout seconds,
+    or held by a dead process on this host, is taken over.
+    Returns the token written to the lock, None if the shard is taken.
+    """
+    lock_path = _shard_path(run_dir, shard_id, "lock")
+    try:
+        _remove_stale_lock(lock_path, lock_timeout)
+    except OSError:
+        # no lock, or another worker moved it first
+        pass
+
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    tmp_path = f"{lock_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(token)
+    try:
+        os.link(tmp_path, lock_path)
+    except FileExistsError:
+        return None
+    finally:
+        os.remove(tmp_path)
+    return token
+
+
+def _owns_lock(lock_path, token):
+    try:
+        with open(lock_path) as f:
+            return f.read() == token
+    except FileNotFoundError:
+        return False
+
+
+def _read_jsonl(path):
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # last line of a crashed worker may be partially written
+                pass
+    return records
+
+
+def _append_jsonl(path, record):
+    with open(path, "ab+") as f:
+        # cut a partial last line left by a crashed worker, so the record
+        # is not appended onto it
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                f.seek(0)
+                content = f.read()
+                f.truncate(content.rfind(b"\n") + 1)
+        f.write((json.dumps(record, default=to_json) + "\n").encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _run_shard(run_dir, shard_id, symbols, score_func, token):
+    results_path = _shard_path(run_dir, shard_id, "results.jsonl")
+    failures_path = _shard_path(run_dir, shard_id, "failures.jsonl")
+    lock_path = _shard_path(run_dir, shard_id, "lock")
+
+    finished = {r["symbol"] for r in _read_jsonl(results_path)}
+    finished |= {f["symbol"] for f in _read_jsonl(failures_path) if f["permanent"]}
+
+    for symbol in symbols:
+        if symbol in finished:
+            continue
+        try:
+            metrics, score = score_func(symbol)
+        except Exception as e:
+            print(f"Failed {symbol}: {e}")
+            _append_jsonl(
+                failures_path,
+                {
+                    "symbol": symbol,
+                    "error": type(e).__name__,
+                    "message": str(e),
+                    "permanent": not is_transient_error(e),
+                },
+            )
+        else:
+            _append_jsonl(results_path, {"symbol": symbol, "metrics": metrics, "score": score})
+        # heartbeat, so the lock is not taken over while the shard is running
+        if not _owns_lock(lock_path, token):
+            print(f"Lost lock of shard {shard_id}, another worker took it over.")
+            return
+        os.utime(lock_path)
+
+    # the shard is done once every symbol has a result or a permanent failure,
+    # so network failures are retried on the next run
+    finished = {r["symbol"] for r in _read_jsonl(results_path)}
+    finished |= {f["symbol"] for f in _read_jsonl(failures_path) if f["permanent"]}
+    if finished.issuperset(symbols):
+        open(_shard_path(run_dir, shard_id, "done"), "w").close()
+    if _owns_lock(lock_path, token):
+        os.remove(lock_path)
+
+
+def run_worker(run_dir, score_func=score_symbol, lock_timeout=1800):
+    """
+    Process shards of the run in run_dir until none is left to claim.
+    Any number of workers, on this or other machines sharing run_dir, can run at once.
+    Returns:
+        int: number of shards processed by this worker.
+    """
+    manifest = load_manifest(run_dir)
+    processed = 0
+    for shard_id, symbols in enumerate(get_shards(manifest)):
+        if os.path.exists(_shard_path(run_dir, shard_id, "done")):
+            continue
+        token = _claim_shard(run_dir, shard_id, lock_timeout)
+        if token is None:
+            continue
+        if os.path.exists(_shard_path(run_dir, shard_id, "done")):
+            # finished by another worker between the check and the claim
+            os.remove(_shard_path(run_dir, shard_id, "lock"))
+            continue
+        _run_shard(run_dir, shard_id, symbols, score_func, token)
+        processed += 1
+    return processed
+
+
+def _run_worker_process(args):
+    return run_worker(*args)
+
+
+def run_batch(symbols, run_dir, shard_size=50, processes=1, score_func=score_symbol, lock_timeout=1800):
+    """
+    Score symbols in shards with checkpoints in run_dir.
+
+    Calling it again with the same run_dir resumes the run: finished symbols
+    and permanent failures are skipped, network and timeout failures are retried.
+    Returns:
+        dict: counts of done shards, results and failures.
+    """
+    create_run(run_dir, symbols, shard_size)
+    if processes > 1:
+        with Pool(processes) as pool:
+            pool.map(_run_worker_process, [(run_dir, score_func, lock_timeout)] * processes)
+    else:
+        run_worker(run_dir, score_func, lock_timeout)
+    return run_status(run_dir)
+
+
+def run_status(run_dir):
+    manifest = load_manifest(run_dir)
+    shards = get_shards(manifest)
+    results, failures = collect_results(run_dir)
+    done = sum(os.path.exists(_shard_path(run_dir, i, "done")) for i in range(len(shards)))
+    return {"shards": len(shards), "done": done, "results": len(results), "failures": len(failures)}
+
+
+def collect_results(run_dir):
+    """
+    Results and failures checkpointed so far.
+    Returns:
+        tuple: (symbol -> result record, symbol -> latest failure record without a result).
+    """
+    manifest = load_manifest(run_dir)
+    results, failures = {}, {}
+    for shard_id in range(len(get_shards(manifest))):
+        for record in _read_jsonl(_shard_path(run_dir, shard_id, "results.jsonl")):
+            results[record["symbol"]] = record
+        for record in _read_jsonl(_shard_path(run_dir, shard_id, "failures.jsonl")):
+            failures[record["symbol"]] = record
+    failures = {s: f for s, f in failures.items() if s not in results}
+    return results, failures
+
+
+def write_results(run_dir, output_root, run_date=None):
+    """
+    Write the results of a run to Parquet with ResultWriter.
+    """
+    results, _ = collect_results(run_dir)
+    with ResultWriter(output_root, run_date=run_date) as writer:
+        for record in results.values():
+            writer.add(record["symbol"], record["metrics"], record["score"])
+    return writer.path
@@ -2,7 +2,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 
-def calculate_fundamental_score(ticker):
+def calculate_fundamental_flags(ticker):
     # Fetch data using yfinance
     stock = yf.Ticker(ticker+'.NS')
     
@@ -44,16 +44,23 @@ def calculate_fundamental_score(ticker):
 
     # Assign scores to each metric based on thresholds
     scores = {
-        'ROE': 1 if roe > 0.15 else 0,
-        'Net Profit Margin': 1 if net_profit_margin > 0.1 else 0,
-        'P/E Ratio': 1 if pe_ratio < 20 else 0,
-        'P/B Ratio': 1 if pb_ratio < 3 else 0,
-        'Debt-to-Equity': 1 if debt_to_equity < 1 else 0,
-        'ROA': 1 if roa > 0.05 else 0,
-        'Asset Turnover': 1 if asset_turnover > 0.5 else 0,
-        'Revenue Growth': 1 if revenue_growth > 0.05 else 0,
-        'Net Income Growth': 1 if net_income_growth > 0.05 else 0
+        'ROE': bool(roe > 0.15),
+        'Net Profit Margin': bool(net_profit_margin > 0.1),
+        'P/E Ratio': bool(pe_ratio < 20),
+        'P/B Ratio': bool(pb_ratio < 3),
+        'Debt-to-Equity': bool(debt_to_equity < 1),
+        'ROA': bool(roa > 0.05),
+        'Asset Turnover': bool(asset_turnover > 0.5),
+        'Revenue Growth': bool(revenue_growth > 0.05),
+        'Net Income Growth': bool(net_income_growth > 0.05)
     }
+    return scores
+
+
+def calculate_fundamental_score(ticker):
+    scores = calculate_fundamental_flags(ticker)
+    if scores is None:
+        return None
     return_dict = {}
 
     for metric, score in scores.items():
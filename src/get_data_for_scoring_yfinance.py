@@ -6,6 +6,10 @@ from indicators.bollinger_bands import bollinger_bands
 from indicators.average_directional_index import average_directional_index
 from indicators.ma import ma
 from indicators.stochastic_oscillator import stochastic_fast
+from indicators.context import IndicatorContext
+from indicators.primitives import rolling_mean
+from indicators.stochastic_rsi import relative_strength_index
+from src.timeframes import resample_ohlcv
 
 
 
@@ -15,17 +19,18 @@ def calculate_growth_rate(current, previous):
         return ((current - previous) / previous) * 100
     return None
 
-def get_beta(stock_symbol, market_symbol='^NSEI', period='1y'):
+def get_beta(stock_symbol, market_symbol='^NSEI', period='1y', ctx=None):
     # Download stock and market data using yfinance
-    stock = yf.Ticker(stock_symbol)
+    # ctx: IndicatorContext over already downloaded stock history for the same period
     market = yf.Ticker(market_symbol)
     
     # Download the historical data for both the stock and the market index
-    stock_data = stock.history(period=period)
+    if ctx is None:
+        ctx = IndicatorContext(yf.Ticker(stock_symbol).history(period=period))
+    stock_data = pd.DataFrame({'Return': ctx.returns('Close')})
     market_data = market.history(period=period)
     
-    # Calculate daily percentage returns for the stock and the market
-    stock_data['Return'] = stock_data['Close'].pct_change()
+    # Calculate daily percentage returns for the market
     market_data['Return'] = market_data['Close'].pct_change()
     
     # Align both dataframes to ensure we're comparing the same dates
@@ -44,24 +49,22 @@ def get_beta(stock_symbol, market_symbol='^NSEI', period='1y'):
     beta = covariance / market_variance
     return beta
 
-def get_atr(stock_symbol, period=14):
+def get_atr(stock_symbol, period=14, ctx=None):
     # Download historical stock data using yfinance
-    stock = yf.Ticker(stock_symbol)
-    data = stock.history(period="1y")  # Download 1 year of historical data
-
-    # Calculate the True Range (TR) for each day
-    data['High-Low'] = data['High'] - data['Low']
-    data['High-Close'] = (data['High'] - data['Close'].shift()).abs()
-    data['Low-Close'] = (data['Low'] - data['Close'].shift()).abs()
+    # ctx: IndicatorContext over already downloaded 1 year stock history
+    if ctx is None:
+        stock = yf.Ticker(stock_symbol)
+        ctx = IndicatorContext(stock.history(period="1y"))  # Download 1 year of historical data
+    data = ctx.df
 
-    # Calculate the True Range for each day (maximum of the 3 values)
-    data['True Range'] = data[['High-Low', 'High-Close', 'Low-Close']].max(axis=1)
+    # Calculate the True Range (TR) for each day (maximum of High-Low, High-Close, Low-Close)
+    true_range = ctx.true_range()
 
     # Calculate the ATR as the moving average of the True Range over the specified period
-    data['ATR'] = data['True Range'].rolling(window=period).mean()
+    atr = rolling_mean(true_range, period)
 
     # Get the latest ATR value
-    latest_atr = data['ATR'].iloc[-1]
+    latest_atr = atr.iloc[-1]
     
     # Get the current stock price
     current_price = data['Close'].iloc[-1]
@@ -71,6 +74,80 @@ def get_atr(stock_symbol, period=14):
     return atr_percentage
 
 
+def get_multi_timeframe_metrics(history):
+    # Weekly and monthly metrics derived from the daily history, no extra download
+    metrics = {}
+    weekly = resample_ohlcv(history, "weekly")
+    weekly_ctx = IndicatorContext(weekly)
+    weekly = relative_strength_index(df=weekly, ctx=weekly_ctx)
+    weekly = macd(df=weekly, ctx=weekly_ctx)
+    metrics['Weekly RSI'] = round(float(weekly['RSI'].iloc[-1]), 2)
+    metrics['Weekly MACD Signal Line Cross'] = round(float(weekly['MACD_HIST'].iloc[-1]), 2)
+
+    monthly = resample_ohlcv(history, "monthly")
+    monthly = ma(df=monthly, period=10)
+    # In percent, the scale of its scoring range
+    metrics['Price Above Monthly SMA-10 (%)'] = float(round((monthly['Close'].iloc[-1] - monthly['MA_10'].iloc[-1]) / monthly['MA_10'].iloc[-1] * 100, 2))
+    return metrics
+
+
+def get_price_metrics(stock_symbol, stock=None):
+    # Valuation, technical and price metrics: everything get_data derives from the
+    # price history and the price dependent info fields, no financial statements.
+    if stock is None:
+        stock = yf.Ticker(stock_symbol)
+    info = stock.info
+    history = stock.history(period="1y")
+    ctx = IndicatorContext(history)
+    metrics = {}
+    # Valuation Metrics
+    if info.get("trailingPE") != None:
+        metrics["P/E Ratio"] = info.get("trailingPE")
+    if info.get("priceToBook") != None:
+        metrics["P/B Ratio"] = info.get("priceToBook")
+
+    # Momentum and Volatility Metrics
+
+    atr_percentage = get_atr(stock_symbol, ctx=ctx)
+    metrics["Volatility (ATR %)"]= float(atr_percentage)
+
+    metrics['Beta']= float(get_beta(stock_symbol=stock_symbol, ctx=ctx))
+    history = stochastic_rsi(df=history, ctx=ctx)
+    history = macd(df=history, ctx=ctx)
+    history = bollinger_bands(df=history, ctx=ctx)
+    history = average_directional_index(df=history, ctx=ctx)
+    history = ma(df=history, period=50, ctx=ctx)
+    history = stochastic_fast(df=history, ctx=ctx)
+    history = ma(df=history, period=200, ctx=ctx)
+    history['Volatility (%)'] = ((history['High'] - history['Low']) / history['Close']) * 100
+    metrics['Volatility (%)'] = float(history['Volatility (%)'].mean())
+
+    metrics['RSI'] = round(float(history['RSI'].iloc[-1]), 2)
+    metrics['MACD Signal Line Cross'] =  round(float(history['MACD_HIST'].iloc[-1]),2)
+    metrics['Volume Change (%)'] =  float(round((history['Volume'].iloc[-1] - history['Volume'].iloc[-2])/ history['Volume'].iloc[-2], 2))
+    metrics['Price Above SMA-200 (%)'] = float(round((history['Close'].iloc[-1] - history['MA_200'].iloc[-1]) / history['MA_200'].iloc[-1], 2))
+    metrics['Stochastic Oscillator'] = round(float(history['STOCH_FAST_D'].iloc[-1]),2)
+    metrics['SMA-50 vs SMA-200'] = float(round((history['MA_50'].iloc[-1] - history['MA_200'].iloc[-1])/ history['MA_200'].iloc[-1], 2))
+    metrics['Price Change (%)'] =  float(round((history['Close'].iloc[-1] - history['Close'].iloc[-2])/ history['Close'].iloc[-2], 2))
+    metrics['Bollinger Bands %B'] =  float(round((history['BB_UPPER'].iloc[-1] - history['BB_LOWER'].iloc[-1]) / history['BB_LOWER'].iloc[-1], 2))
+    metrics.update(get_multi_timeframe_metrics(history))
+    # Market and Price Metrics:
+    market_price = info.get("currentPrice")
+    price_52_week_high = history["High"].max()
+    price_52_week_low = history["Low"].min()
+    price_moved_from_52_week_high = ((market_price- price_52_week_high) / price_52_week_high) * 100
+    metrics['Price Moved from 52-Week High (%)'] = float(price_moved_from_52_week_high)
+    metrics["Price (₹)"] = market_price
+    metrics['Market Cap (₹)'] = info.get('marketCap') if info.get("marketCap") else 0
+    price_moved_from_52_week_low = ((market_price- price_52_week_low) / price_52_week_low) * 100
+    metrics['Price Away from 52-Week Low (%)'] = float(price_moved_from_52_week_low)
+    metrics['PEG Ratio'] =  info.get('trailingPegRatio') if info.get("trailingPegRatio") is not None else 0
+    # Dividend Metrics
+    metrics['MACD Signal'] = float(history['MACD_SIGN'].iloc[-1])
+    metrics["Dividend Yield (%)"] = info.get("dividendYield") * 100 if info.get("dividendYield") else 0
+    return metrics
+
+
 def get_data(stock_symbol):
     stock = yf.Ticker(stock_symbol)
     info = stock.info
@@ -78,12 +155,7 @@ def get_data(stock_symbol):
     balance_sheet = stock.balance_sheet
     cashflow = stock.cashflow
     metrics = {}
-    history = stock.history(period="1y")
     # Valuation Metrics
-    if info.get("trailingPE") != None:
-        metrics["P/E Ratio"] = info.get("trailingPE")
-    if info.get("priceToBook") != None:
-        metrics["P/B Ratio"] = info.get("priceToBook")
     if info.get("PegRatio") != None:
         metrics["PEG Ratio"] = info.get("PegRatio")
     if info.get("debtToEquity") != None:
@@ -253,51 +325,13 @@ def get_data(stock_symbol):
     metrics["Interest Coverage Ratio"] = ebit / abs(interest_expense) if ebit and interest_expense else 0
 
 
-    # Momentum and Volatility Metrics
-
-    atr_percentage = get_atr(stock_symbol)
-    metrics["Volatility (ATR %)"]= float(atr_percentage)
-
-    metrics['Beta']= float(get_beta(stock_symbol=stock_symbol))
-    history = stochastic_rsi(df=history)
-    history = macd(df=history)
-    history = bollinger_bands(df=history)
-    history = average_directional_index(df=history)
-    history = ma(df=history, period=50)
-    history = stochastic_fast(df=history)
-    history = ma(df=history, period=200)
-    history['Volatility (%)'] = ((history['High'] - history['Low']) / history['Close']) * 100
-    metrics['Volatility (%)'] = float(history['Volatility (%)'].mean())
-
-
     # Ownership and Sentiment Metrics
 
     # TODO: Promoter Holding Change (%)
     # TODO: Institutional Holding Change (%)
     metrics['Promoter Holding'] = stock.info.get("heldPercentInsiders", "N/A")
     metrics['Institutions Holding'] = stock.info.get("heldPercentInstitutions", "N/A")
-    metrics['RSI'] = round(float(history['RSI'].iloc[-1]), 2)
-    metrics['MACD Signal Line Cross'] =  round(float(history['MACD_HIST'].iloc[-1]),2)
-    metrics['Volume Change (%)'] =  float(round((history['Volume'].iloc[-1] - history['Volume'].iloc[-2])/ history['Volume'].iloc[-2], 2))
-    metrics['Price Above SMA-200 (%)'] = float(round((history['Close'].iloc[-1] - history['MA_200'].iloc[-1]) / history['MA_200'].iloc[-1], 2))
-    metrics['Stochastic Oscillator'] = round(float(history['STOCH_FAST_D'].iloc[-1]),2)
-    metrics['SMA-50 vs SMA-200'] = float(round((history['MA_50'].iloc[-1] - history['MA_200'].iloc[-1])/ history['MA_200'].iloc[-1], 2))
-    metrics['Price Change (%)'] =  float(round((history['Close'].iloc[-1] - history['Close'].iloc[-2])/ history['Close'].iloc[-2], 2))
-    metrics['Bollinger Bands %B'] =  float(round((history['BB_UPPER'].iloc[-1] - history['BB_LOWER'].iloc[-1]) / history['BB_LOWER'].iloc[-1], 2))
-    # Market and Price Metrics:
-    market_price = info.get("currentPrice")
-    price_52_week_high = history["High"].max()
-    price_52_week_low = history["Low"].min()
-    price_moved_from_52_week_high = ((market_price- price_52_week_high) / price_52_week_high) * 100
-    metrics['Price Moved from 52-Week High (%)'] = float(price_moved_from_52_week_high)
-    metrics["Price (₹)"] = market_price
-    metrics['Market Cap (₹)'] = info.get('marketCap') if info.get("marketCap") else 0
-    price_moved_from_52_week_low = ((market_price- price_52_week_low) / price_52_week_low) * 100
-    metrics['Price Away from 52-Week Low (%)'] = float(price_moved_from_52_week_low)
-    metrics['PEG Ratio'] =  info.get('trailingPegRatio') if info.get("trailingPegRatio") is not None else 0
-    # Dividend Metrics
-    metrics['MACD Signal'] = float(history['MACD_SIGN'].iloc[-1])
-    metrics["Dividend Yield (%)"] = info.get("dividendYield") * 100 if info.get("dividendYield") else 0
+    metrics.update(get_price_metrics(stock_symbol, stock=stock))
 
     return metrics
 
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from src.scoring import score_symbol
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Fewest daily returns (shared with the market) a symbol needs to enter the risk statistics
+MIN_HISTORY = 60
+
+
+def holdings_matrix(holdings):
+    """
+    Weights of each portfolio over the union of their symbols.
+    Args:
+        holdings (dict or DataFrame): portfolio -> {symbol: weight}, or a
+            portfolios x symbols frame of weights.
+    Returns:
+        DataFrame: portfolios x symbols, each row normalized to sum to 1.
+    """
+    if not isinstance(holdings, pd.DataFrame):
+        holdings = pd.DataFrame.from_dict(holdings, orient="index")
+    weights = holdings.fillna(0).astype(float)
+    return weights.div(weights.sum(axis=1), axis=0)
+
+
+def download_returns(symbols, market_symbol="^NSEI", period="1y"):
+    """
+    Daily returns of symbols and the market from a single download.
+    Symbols without any data are dropped with a warning; other gaps stay NaN.
+    Returns:
+        DataFrame: dates x (symbols + market_symbol), dates with a market return only.
+    """
+    tickers = list(symbols) + [market_symbol]
+    close = yf.download(tickers, period=period, auto_adjust=True, progress=False)["Close"]
+    close = close.reindex(columns=tickers)
+    missing = [s for s in symbols if close[s].isna().all()]
+    if missing:
+        print(f"No price data for {', '.join(missing)}, dropped from returns.")
+    returns = close.drop(columns=missing).pct_change(fill_method=None)
+    return returns[returns[market_symbol].notna()]
+
+
+def score_symbols(symbols):
+    """
+    calculate_stock_score of each symbol, computed once per symbol.
+    Symbols that cannot be scored are logged and get NaN.
+    """
+    scores = {}
+    for symbol in symbols:
+        try:
+            _, scores[symbol] = score_symbol(symbol)
+        except Exception as e:
+            print(f"Could not score {symbol}: {e}")
+            scores[symbol] = np.nan
+    return pd.Series(scores, dtype=float)
+
+
+def _market_betas(R, valid, market):
+    # Beta of each column against the market over the dates both have a return,
+    # the pairwise version of get_beta
+    n = valid.sum(axis=0)
+    x = np.where(valid, R, 0)
+    m = np.where(valid, market[:, np.newaxis], 0)
+    x_dev = np.where(valid, x - x.sum(axis=0) / n, 0)
+    m_dev = np.where(valid, m - m.sum(axis=0) / n, 0)
+    return (x_dev * m_dev).sum(axis=0) / (m_dev**2).sum(axis=0)
+
+
+def _nearest_psd(covariance):
+    # Pairwise-complete covariances need not form a positive semi-definite matrix,
+    # which allows negative portfolio variances. Clip negative eigenvalues, giving
+    # the nearest PSD matrix in Frobenius norm. Matrices with undefined pairs are kept.
+    if not len(covariance) or not np.isfinite(covariance).all():
+        return covariance
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    if eigenvalues[0] >= -np.finfo(float).eps * len(eigenvalues) * abs(eigenvalues[-1]):
+        return covariance
+    print(
+        f"Pairwise covariance is not positive semi-definite (smallest eigenvalue {eigenvalues[0]:.3g}), "
+        "clipped to the nearest one."
+    )
+    return (eigenvectors * np.clip(eigenvalues, 0, None)) @ eigenvectors.T
+
+
+def evaluate_portfolios(
+    holdings, scores=None, returns=None, market_symbol="^NSEI", period="1y", min_history=MIN_HISTORY
+):
+    """
+    Aggregate score and risk statistics of many portfolios over a shared universe.
+
+    Covariances and betas use the dates each pair of series has in common, so
+    a short or patchy history only affects statistics involving that symbol.
+    When the pairwise covariance is not positive semi-definite it is clipped
+    to the nearest matrix that is, with a warning.
+    Symbols with fewer than min_history returns are excluded from the risk
+    statistics; portfolio risk is then computed over the remaining holdings,
+    renormalized, and risk_coverage reports the weight that was covered.
+    Beta and volatility are NaN for portfolios without covered holdings, and
+    volatility and risk contributions are NaN (with a warning) where the
+    pairwise covariance gives a non-positive or undefined variance.
+    Args:
+        holdings (dict or DataFrame): see holdings_matrix.
+        scores (dict or Series): symbol -> stock score, computed with score_symbols if None.
+        returns (DataFrame): daily returns with a market_symbol column,
+            downloaded with download_returns if None.
+        market_symbol (str): index the portfolio beta is measured against.
+        period (str): history used when returns are downloaded.
+        min_history (int): fewest returns a symbol needs to enter the risk statistics.
+    Returns:
+        dict:
+            summary (DataFrame): per portfolio score, beta, volatility (annualized)
+                and risk_coverage.
+            risk_contributions (DataFrame): portfolios x symbols, share of the
+                portfolio variance from each holding (rows sum to 1).
+            covariance (DataFrame): daily covariance of the symbol returns.
+            betas (Series): beta of each symbol.
+            excluded (list): symbols left out of the risk statistics.
+    """
+    weights = holdings_matrix(holdings)
+    symbols = list(weights.columns)
+    if scores is None:
+        scores = score_symbols(symbols)
+    scores = pd.Series(scores, dtype=float).reindex(symbols)
+    if returns is None:
+        returns = download_returns(symbols, market_symbol=market_symbol, period=period)
+    returns = returns[returns[market_symbol].notna()]
+
+    history = returns.reindex(columns=symbols).notna().sum()
+    covered = [s for s in symbols if history[s] >= min_history]
+    excluded = [s for s in symbols if history[s] < min_history]
+    if excluded:
+        print(f"Less than {min_history} returns for {', '.join(excluded)}, excluded from risk statistics.")
+
+    R = returns[covered].to_numpy()
+    valid = ~np.isnan(R)
+    market = returns[market_symbol].to_numpy()
+    betas = _market_betas(R, valid, market)
+    covariance = _nearest_psd(returns[covered].cov(min_periods=min_history).to_numpy())
+
+    # Risk over the covered holdings, renormalized
+    W = weights[covered].to_numpy()
+    coverage = W.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        W = W / coverage[:, np.newaxis]
+
+        # Portfolio variance w' S w and per holding contributions w_i (S w)_i / w' S w
+        marginal = W @ covariance
+        variance = (marginal * W).sum(axis=1)
+        # Pairs overlapping on fewer than min_history dates have no covariance
+        invalid = ~(variance > 0) & (coverage > 0)
+        if invalid.any():
+            print(
+                f"Non-positive or undefined variance for {', '.join(map(str, weights.index[invalid]))}, "
+                "volatility and risk contributions set to NaN."
+            )
+        variance = np.where(variance > 0, variance, np.nan)
+        contributions = marginal * W / variance[:, np.newaxis]
+
+    # Weighted score over the holdings that could be scored
+    scored = ~np.isnan(scores.to_numpy())
+    score_weights = weights.to_numpy() * scored
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aggregate_score = (score_weights @ np.nan_to_num(scores.to_numpy())) / score_weights.sum(axis=1)
+
+    summary = pd.DataFrame(
+        {
+            "score": aggregate_score,
+            "beta": np.where(coverage > 0, W @ betas, np.nan),
+            "volatility": np.sqrt(variance * TRADING_DAYS_PER_YEAR),
+            "risk_coverage": coverage,
+        },
+        index=weights.index,
+    )
+    return {
+        "summary": summary,
+        "risk_contributions": pd.DataFrame(contributions, index=weights.index, columns=covered).reindex(
+            columns=symbols, fill_value=0.0
+        ),
+        "covariance": pd.DataFrame(covariance, index=covered, columns=covered),
+        "betas": pd.Series(betas, index=covered),
+        "excluded": excluded,
+    }
@@ -0,0 +1,163 @@
+import os
+import uuid
+from datetime import date
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Metrics returned by get_data, stored as float64 columns
+METRIC_FIELDS = [
+    "P/E Ratio",
+    "P/B Ratio",
+    "PEG Ratio",
+    "D/E Ratio",
+    "ROE (%)",
+    "Net Profit Margin (%)",
+    "Operating Margin (%)",
+    "Gross Margin (%)",
+    "Revenue Growth (%)",
+    "FCF Growth (%)",
+    "EPS Growth (%)",
+    "YoY Profit Growth (%)",
+    "YoY Sales Growth (%)",
+    "QoQ Sales Growth (%)",
+    "QoQ Profit Growth (%)",
+    "Current Ratio",
+    "Cash Conversion cycle (Days)",
+    "Interest Coverage Ratio",
+    "Volatility (ATR %)",
+    "Beta",
+    "Volatility (%)",
+    "Promoter Holding",
+    "Institutions Holding",
+    "RSI",
+    "MACD Signal Line Cross",
+    "Volume Change (%)",
+    "Price Above SMA-200 (%)",
+    "Stochastic Oscillator",
+    "SMA-50 vs SMA-200",
+    "Price Change (%)",
+    "Bollinger Bands %B",
+    "Weekly RSI",
+    "Weekly MACD Signal Line Cross",
+    "Price Above Monthly SMA-10 (%)",
+    "Price Moved from 52-Week High (%)",
+    "Price (₹)",
+    "Market Cap (₹)",
+    "Price Away from 52-Week Low (%)",
+    "MACD Signal",
+    "Dividend Yield (%)",
+]
+
+# Checks returned by calculate_fundamental_flags, stored as bool columns
+FUNDAMENTAL_FIELDS = [
+    "ROE",
+    "Net Profit Margin",
+    "P/E Ratio",
+    "P/B Ratio",
+    "Debt-to-Equity",
+    "ROA",
+    "Asset Turnover",
+    "Revenue Growth",
+    "Net Income Growth",
+]
+
+# Fundamental columns are prefixed, some names are also metric names
+FUNDAMENTAL_PREFIX = "Fundamental: "
+
+RESULT_SCHEMA = pa.schema(
+    [pa.field("symbol", pa.string(), nullable=False), pa.field("score", pa.float64())]
+    + [pa.field(name, pa.float64()) for name in METRIC_FIELDS]
+    + [pa.field(FUNDAMENTAL_PREFIX + name, pa.bool_()) for name in FUNDAMENTAL_FIELDS]
+)
+
+
+def _to_float(value):
+    # None, "N/A" and other non numeric values become nulls
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.number)):
+        return None
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _to_bool(value):
+    # calculate_fundamental_score reports flags as emoji
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value == "✅"
+    return bool(value)
+
+
+class ResultWriter:
+    """
+    Collects scored symbols into Arrow record batches and streams them to
+    Parquet under root/run_date=YYYY-MM-DD/.
+
+        with ResultWriter("results") as writer:
+            writer.add(symbol, metrics, score, fundamentals)
+    """
+
+    def __init__(self, root, run_date=None, batch_size=1000):
+        self.root = root
+        self.run_date = run_date or date.today()
+        self.batch_size = batch_size
+        self.path = os.path.join(
+            root, f"run_date={self.run_date.isoformat()}", f"part-{uuid.uuid4().hex}.parquet"
+        )
+        self._rows = []
+        self._writer = None
+
+    def add(self, symbol, metrics, score, fundamentals=None):
+        """
+        Add one symbol. metrics is the dict from get_data (None if it could not be
+        computed), fundamentals the dict from calculate_fundamental_flags or
+        calculate_fundamental_score. Keys outside the schema are ignored.
+        """
+        self._rows.append((symbol, metrics or {}, score, fundamentals or {}))
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _record_batch(self):
+        columns = [
+            pa.array([row[0] for row in self._rows], pa.string()),
+            pa.array([_to_float(row[2]) for row in self._rows], pa.float64()),
+        ]
+        for name in METRIC_FIELDS:
+            columns.append(pa.array([_to_float(row[1].get(name)) for row in self._rows], pa.float64()))
+        for name in FUNDAMENTAL_FIELDS:
+            columns.append(pa.array([_to_bool(row[3].get(name)) for row in self._rows], pa.bool_()))
+        return pa.RecordBatch.from_arrays(columns, schema=RESULT_SCHEMA)
+
+    def _flush(self):
+        if not self._rows:
+            return
+        batch = self._record_batch()
+        self._rows = []
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, RESULT_SCHEMA)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_results(root, run_date=None, columns=None):
+    """
+    Load written results as a DataFrame, optionally for a single run date.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    flt = None if run_date is None else ds.field("run_date") == run_date.isoformat()
+    return dataset.to_table(columns=columns, filter=flt).to_pandas()
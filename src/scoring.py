@@ -0,0 +1,33 @@
+import requests
+
+from src.get_data_for_scoring_yfinance import get_data, get_price_metrics
+from src.scores import calculate_stock_score
+
+# Failures that may succeed on retry. Everything else raised while scoring
+# (missing "Inventory" for banks, None fields in info, ...) happens again.
+TRANSIENT_ERRORS = (requests.exceptions.RequestException, ConnectionError, TimeoutError)
+
+
+def is_transient_error(error):
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def score_symbol(symbol):
+    """
+    Metrics and stock score of a symbol. Returns (metrics, score).
+    Raises ValueError when get_data has insufficient data.
+    """
+    metrics = get_data(stock_symbol=symbol)
+    if metrics is None:
+        raise ValueError(f"Insufficient data for {symbol}.")
+    return metrics, calculate_stock_score(metrics=metrics)
+
+
+def rescore_prices(symbol, metrics, stock=None):
+    """
+    Metrics and stock score of a symbol whose statements did not change since
+    metrics were computed. Only the price and technical metrics are recomputed,
+    the fundamental ones are reused from metrics. Returns (metrics, score).
+    """
+    metrics = {**metrics, **get_price_metrics(symbol, stock=stock)}
+    return metrics, calculate_stock_score(metrics=metrics)
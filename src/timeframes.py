@@ -0,0 +1,73 @@
+import pandas as pd
+
+# pandas resample rules for each supported timeframe (labelled by period end)
+TIMEFRAME_RULES = {
+    "weekly": "W-FRI",
+    "monthly": "ME",
+}
+
+# How daily OHLCV fields combine into a longer bar. Every function here is
+# associative, so already resampled bars can be re-aggregated with new ones.
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def _aggregate(frame, grouper):
+    """
+    Aggregate OHLCV bars by grouper.
+
+    frame is either a single symbol frame with OHLCV columns or a panel with
+    (field, symbol) MultiIndex columns as returned by yf.download. For a panel
+    each field is aggregated for all symbols at once.
+    """
+    if isinstance(frame.columns, pd.MultiIndex):
+        fields = [f for f in OHLCV_AGGREGATION if f in frame.columns.get_level_values(0)]
+        parts = [frame[f].groupby(grouper).agg(OHLCV_AGGREGATION[f]) for f in fields]
+        result = pd.concat(parts, axis=1, keys=fields)
+    else:
+        aggregation = {f: a for f, a in OHLCV_AGGREGATION.items() if f in frame.columns}
+        result = frame.groupby(grouper).agg(aggregation)
+    # periods without any trading day (e.g. holiday weeks)
+    close = result["Close"]
+    empty = close.isna().all(axis=1) if isinstance(close, pd.DataFrame) else close.isna()
+    return result[~empty]
+
+
+def resample_ohlcv(daily, timeframe):
+    """
+    Derive weekly or monthly OHLCV bars from daily bars.
+    Args:
+        daily (DataFrame): daily bars, single symbol or (field, symbol) panel.
+        timeframe (str): "weekly" or "monthly".
+    Returns:
+        DataFrame: resampled bars, the last one being the current partial period.
+    """
+    if timeframe not in TIMEFRAME_RULES:
+        raise ValueError(f"Unsupported timeframe {timeframe}.")
+    return _aggregate(daily, pd.Grouper(freq=TIMEFRAME_RULES[timeframe]))
+
+
+def update_resampled(resampled, new_daily, timeframe):
+    """
+    Fold newly arrived daily bars into previously resampled bars.
+
+    Only the new daily bars are resampled; the ones falling in the current
+    partial period are merged into its bar instead of recomputing the history.
+    Args:
+        resampled (DataFrame): output of resample_ohlcv.
+        new_daily (DataFrame): daily bars after the last bar used for resampled.
+        timeframe (str): "weekly" or "monthly".
+    Returns:
+        DataFrame: updated resampled bars.
+    """
+    if new_daily.empty:
+        return resampled
+    new_bars = resample_ohlcv(new_daily, timeframe)
+    overlap = resampled.index.isin(new_bars.index)
+    merged = _aggregate(pd.concat([resampled[overlap], new_bars]), pd.Grouper(level=0))
+    return pd.concat([resampled[~overlap], merged])
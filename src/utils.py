@@ -0,0 +1,11 @@
+import numpy as np
+
+
+def to_json(value):
+    """
+    json.dumps default for metrics: numpy scalars become Python numbers,
+    anything else unknown its string.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
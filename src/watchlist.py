@@ -0,0 +1,168 @@
+import json
+import os
+import time
+
+import yfinance as yf
+
+from src.scores import BUY_SCORE_THRESHOLD
+from src.scoring import is_transient_error, rescore_prices, score_symbol
+from src.utils import to_json
+
+# info fields read by get_data that move with the price, see get_price_metrics
+PRICE_INFO_FIELDS = [
+    "currentPrice",
+    "marketCap",
+    "trailingPE",
+    "priceToBook",
+    "trailingPegRatio",
+    "dividendYield",
+]
+
+# info fields read by get_data that only change with new statements, plus the
+# periods of the latest published statements
+STATEMENT_INFO_FIELDS = [
+    "mostRecentQuarter",
+    "lastFiscalYearEnd",
+    "debtToEquity",
+    "returnOnEquity",
+    "profitMargins",
+    "operatingMargins",
+    "grossMargins",
+    "earningsGrowth",
+    "currentRatio",
+    "heldPercentInsiders",
+    "heldPercentInstitutions",
+]
+
+
+def get_fingerprint(stock_symbol, stock=None):
+    """
+    Fingerprint of the inputs get_data scores a symbol from, split in a
+    "prices" part (price fields and latest bar) and a "statements" part.
+    Only the latest bars and info are fetched, not statements or 1y history.
+    """
+    if stock is None:
+        stock = yf.Ticker(stock_symbol)
+    info = stock.info
+    history = stock.history(period="5d")
+    prices = {field: info.get(field) for field in PRICE_INFO_FIELDS}
+    prices["lastBar"] = str(history.index[-1]) if not history.empty else None
+    fingerprint = {
+        "prices": prices,
+        "statements": {field: info.get(field) for field in STATEMENT_INFO_FIELDS},
+    }
+    return json.loads(json.dumps(fingerprint, default=to_json))
+
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def save_state(state, state_path):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, default=to_json)
+    os.replace(tmp_path, state_path)
+
+
+def crossed_threshold(previous_score, score, threshold=BUY_SCORE_THRESHOLD):
+    """
+    Returns "buy" or "sell" when score crossed threshold since previous_score, else None.
+    """
+    if previous_score is None or score is None:
+        return None
+    if previous_score < threshold <= score:
+        return "buy"
+    if score < threshold <= previous_score:
+        return "sell"
+    return None
+
+
+def refresh_watchlist(symbols, state, on_alert=print):
+    """
+    Rescore the symbols whose fingerprint changed since the last refresh.
+    When only prices changed, the price and technical metrics are recomputed and
+    the fundamental metrics are reused from state.
+    Args:
+        symbols (list): stock symbols, e.g. "TCS.NS".
+        state (dict): per symbol fingerprint, metrics and score (plus error when
+            scoring failed for that fingerprint), updated in place. State saved
+            with an older fingerprint layout is rescored in full once.
+        on_alert (callable): called with an alert dict when a score crosses the threshold.
+    Returns:
+        list: symbols that were rescored.
+    """
+    rescored = []
+    for symbol in symbols:
+        stock = yf.Ticker(symbol)
+        try:
+            fingerprint = get_fingerprint(symbol, stock=stock)
+        except Exception as e:
+            print(f"Could not fingerprint {symbol}: {e}")
+            continue
+        previous = state.get(symbol, {})
+        previous_fingerprint = previous.get("fingerprint") or {}
+        if previous_fingerprint == fingerprint:
+            continue
+        same_statements = previous_fingerprint.get("statements") == fingerprint["statements"]
+        if same_statements and previous.get("metrics") is None and "error" in previous:
+            # scoring the statements failed and they did not change, it fails again
+            previous["fingerprint"] = fingerprint
+            continue
+
+        try:
+            if same_statements and previous.get("metrics") is not None:
+                metrics, score = rescore_prices(symbol, previous["metrics"], stock=stock)
+            else:
+                metrics, score = score_symbol(symbol)
+        except Exception as e:
+            print(f"Could not score {symbol}: {e}")
+            if is_transient_error(e):
+                # fingerprint not stored, so the symbol is retried on the next poll
+                continue
+            # the same inputs fail again, skip the symbol until its fingerprint changes;
+            # fundamental metrics that were reused are kept for the next price change
+            state[symbol] = {
+                "fingerprint": fingerprint,
+                "metrics": previous.get("metrics") if same_statements else None,
+                "score": None,
+                "error": f"{type(e).__name__}: {e}",
+            }
+            rescored.append(symbol)
+            continue
+
+        signal = crossed_threshold(previous.get("score"), score)
+        if signal:
+            on_alert(
+                {
+                    "symbol": symbol,
+                    "signal": signal,
+                    "previous_score": previous.get("score"),
+                    "score": score,
+                }
+            )
+        state[symbol] = {"fingerprint": fingerprint, "metrics": metrics, "score": score}
+        rescored.append(symbol)
+    return rescored
+
+
+def run_watchlist(symbols, state_path, interval=None, on_alert=print):
+    """
+    Refresh the watchlist, persisting state to state_path between runs.
+    With interval (seconds) it keeps polling, otherwise it refreshes once.
+    Failures of single symbols are logged and do not stop the polling.
+    """
+    state = load_state(state_path)
+    while True:
+        rescored = refresh_watchlist(symbols, state, on_alert=on_alert)
+        try:
+            save_state(state, state_path)
+        except OSError as e:
+            print(f"Could not save watchlist state to {state_path}: {e}")
+        print(f"Rescored {len(rescored)} of {len(symbols)} symbols.")
+        if interval is None:
+            return state
+        time.sleep(interval)
@@ -0,0 +1,219 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from src.scores import SCORING_CRITERIA, BUY_SCORE_THRESHOLD
+
+# Position of each criteria field along the last axis of a parameter tensor
+MIN_VAL, MAX_VAL, HIGHER_IS_BETTER, WEIGHT = range(4)
+
+
+def criteria_to_array(criteria, metric_names):
+    """
+    Convert a scoring criteria dict into an array of shape (metrics, 4).
+    """
+    return np.array([criteria[m] for m in metric_names], dtype=np.float64)
+
+
+def criteria_grid(options, base=SCORING_CRITERIA):
+    """
+    Cartesian product of criteria options.
+    Args:
+        options (dict): metric -> list of (min_val, max_val, higher_is_better, weight).
+        base (dict): criteria used for the metrics not in options.
+    Returns:
+        tuple: (metric_names, parameter tensor of shape (configs, metrics, 4)).
+    """
+    metric_names = list(base)
+    base_params = criteria_to_array(base, metric_names)
+    swept = list(options)
+    combos = list(itertools.product(*(options[m] for m in swept)))
+
+    params = np.repeat(base_params[np.newaxis], len(combos), axis=0)
+    for j, metric in enumerate(swept):
+        params[:, metric_names.index(metric)] = [combo[j] for combo in combos]
+    return metric_names, params
+
+
+def sample_criteria(n, base=SCORING_CRITERIA, range_jitter=0.2, weight_range=(0.5, 1.5), seed=None):
+    """
+    Random criteria configurations around base.
+
+    min_val and max_val are shifted by up to range_jitter of the base range,
+    weights are drawn uniformly from weight_range and directions are kept.
+    Returns:
+        tuple: (metric_names, parameter tensor of shape (n, metrics, 4)).
+    """
+    rng = np.random.default_rng(seed)
+    metric_names = list(base)
+    base_params = criteria_to_array(base, metric_names)
+    params = np.repeat(base_params[np.newaxis], n, axis=0)
+
+    span = np.abs(base_params[:, MAX_VAL] - base_params[:, MIN_VAL])
+    for field in (MIN_VAL, MAX_VAL):
+        params[:, :, field] += rng.uniform(-range_jitter, range_jitter, (n, len(metric_names))) * span
+    params[:, :, WEIGHT] = rng.uniform(*weight_range, (n, len(metric_names)))
+    return metric_names, params
+
+
+def build_metric_cube(metrics, metric_names):
+    """
+    Metric cube of shape (dates, symbols, metrics) from a long frame.
+    Args:
+        metrics (DataFrame): indexed by (date, symbol), one column per metric.
+        metric_names (list): metric order of the parameter tensor.
+    Returns:
+        tuple: (dates, symbols, cube). Missing metrics are NaN.
+    """
+    dates = metrics.index.get_level_values(0).unique().sort_values()
+    symbols = metrics.index.get_level_values(1).unique().sort_values()
+    full_index = pd.MultiIndex.from_product([dates, symbols])
+    values = metrics.reindex(index=full_index, columns=metric_names).to_numpy(dtype=np.float64)
+    return dates, symbols, values.reshape(len(dates), len(symbols), len(metric_names))
+
+
+def forward_returns(close, horizon=20):
+    """
+    Forward return over horizon bars for a dates x symbols close frame.
+    """
+    return close.shift(-horizon) / close - 1
+
+
+def score_cube(params, cube, dtype=np.float64, block_elements=2**16):
+    """
+    Scores of every configuration for every date and symbol.
+
+    Same as calculate_stock_score with each configuration as criteria, a NaN
+    metric counting as absent. dynamic_score is evaluated as
+    clip(slope * value + intercept, 0, 1) with the weight folded in, one
+    metric at a time for all configurations.
+    block_elements bounds the size of the per-metric temporary.
+    Returns:
+        array: shape (configs, dates, symbols).
+    """
+    n_dates, n_symbols, n_metrics = cube.shape
+    values = cube.reshape(-1, n_metrics).astype(dtype)
+    present = ~np.isnan(values)
+    count = present.sum(axis=1).astype(dtype)
+
+    min_val = params[:, :, MIN_VAL].astype(dtype)
+    max_val = params[:, :, MAX_VAL].astype(dtype)
+    higher = params[:, :, HIGHER_IS_BETTER].astype(bool)
+    weight = params[:, :, WEIGHT].astype(dtype)
+    # dynamic_score only scales linearly when min_val < max_val, otherwise it is a step at min_val
+    inverted = min_val >= max_val
+
+    total = np.zeros((len(params), len(values)), dtype=dtype)
+    # rows are processed in blocks so the (configs, rows) temporaries stay in cache
+    block = max(1, block_elements // len(params))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # weight * clip(x, 0, 1) == clip(weight * x, min(0, weight), max(0, weight))
+        scale = weight / (max_val - min_val)
+        slope = np.where(higher, scale, -scale)[:, :, np.newaxis]
+        intercept = (np.where(higher, -min_val, max_val) * scale)[:, :, np.newaxis]
+        lower = np.minimum(weight, 0)[:, :, np.newaxis]
+        upper = np.maximum(weight, 0)[:, :, np.newaxis]
+
+        for lo in range(0, len(values), block):
+            hi = min(lo + block, len(values))
+            block_total = total[:, lo:hi]
+            base = np.empty_like(block_total)
+            for m in range(n_metrics):
+                value = values[lo:hi, m]
+                rows = present[lo:hi, m]
+                if not rows.any():
+                    continue
+
+                np.multiply(slope[:, m], value, out=base)
+                base += intercept[:, m]
+                np.maximum(base, lower[:, m], out=base)
+                np.minimum(base, upper[:, m], out=base)
+                steps = inverted[:, m]
+                if steps.any():
+                    above_min = value > min_val[steps, m, np.newaxis]
+                    step = np.where(higher[steps, m, np.newaxis], above_min, ~above_min)
+                    base[steps] = step * weight[steps, m, np.newaxis]
+                if not rows.all():
+                    base[:, ~rows] = 0
+                block_total += base
+
+        scores = np.where(count > 0, total / count, 0)
+    return scores.reshape(len(params), n_dates, n_symbols)
+
+
+def sweep(
+    params,
+    cube,
+    returns,
+    threshold=BUY_SCORE_THRESHOLD,
+    chunk_size=None,
+    max_chunk_bytes=256 * 2**20,
+    dtype=np.float64,
+):
+    """
+    Forward-return statistics for every criteria configuration.
+
+    Scoring dominates the run time: about 5 million scores (configuration x
+    date x symbol) per second on one core with the 34 default metrics, about
+    7 million in float32. 10,000 configurations over 250 dates x 200 symbols
+    take about 100 s; parallelize over configurations for larger sweeps.
+    Args:
+        params (array): parameter tensor of shape (configs, metrics, 4).
+        cube (array): metric cube of shape (dates, symbols, metrics).
+        returns (array): forward returns of shape (dates, symbols), NaN where unknown.
+        threshold (float): scores at or above it are buy signals.
+        chunk_size (int): configurations evaluated at once, derived from max_chunk_bytes if None.
+        dtype: float type the scores are computed in. float32 halves memory but
+            scores near threshold may then land on the other side than with
+            calculate_stock_score.
+    Returns:
+        DataFrame: one row per configuration with
+            n_buy, buy_return, sell_return, spread, hit_rate and ic
+            (mean cross-sectional correlation between score and forward return).
+    """
+    returns = np.asarray(returns, dtype=dtype)
+    valid = ~np.isnan(returns) & ~np.isnan(cube).all(axis=-1)
+    fwd = np.where(valid, returns, 0)
+    if chunk_size is None:
+        # a few (configs, dates, symbols) temporaries are alive at once
+        chunk_size = max(1, max_chunk_bytes // (valid.size * np.dtype(dtype).itemsize * 4))
+
+    stats = []
+    for start in range(0, len(params), chunk_size):
+        scores = score_cube(params[start : start + chunk_size], cube, dtype=dtype)
+        buy = (scores >= threshold) & valid
+        sell = ~buy & valid
+
+        n_buy = buy.sum(axis=(1, 2))
+        n_sell = sell.sum(axis=(1, 2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            buy_return = (buy * fwd).sum(axis=(1, 2)) / n_buy
+            sell_return = (sell * fwd).sum(axis=(1, 2)) / n_sell
+            hit_rate = (buy & (fwd > 0)).sum(axis=(1, 2)) / n_buy
+
+            # cross-sectional correlation per date, averaged over dates
+            n = valid.sum(axis=1)
+            s = np.where(valid, scores, 0)
+            s_mean = s.sum(axis=2) / n
+            r_mean = fwd.sum(axis=1) / n
+            s_dev = np.where(valid, s - s_mean[..., np.newaxis], 0)
+            r_dev = np.where(valid, fwd - r_mean[:, np.newaxis], 0)
+            cov = (s_dev * r_dev).sum(axis=2)
+            corr = cov / np.sqrt((s_dev**2).sum(axis=2) * (r_dev**2).sum(axis=1))
+            ic = np.nanmean(np.where(np.isfinite(corr), corr, np.nan), axis=1)
+
+        stats.append(
+            pd.DataFrame(
+                {
+                    "n_buy": n_buy,
+                    "buy_return": buy_return,
+                    "sell_return": sell_return,
+                    "spread": buy_return - sell_return,
+                    "hit_rate": hit_rate,
+                    "ic": ic,
+                },
+                index=pd.RangeIndex(start, start + len(scores), name="config"),
+            )
+        )
+    return pd.concat(stats)
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from src import batch_runner
+from src.batch_runner import _append_jsonl, _claim_shard, _read_jsonl, _shard_path, collect_results, run_batch
+
+SYMBOLS = ["A", "B", "C", "D", "E"]
+
+
+class Crash(BaseException):
+    pass
+
+
+def make_score_func(calls, fail=None, crash_after=None):
+    # fail: symbol -> exception raised the first time the symbol is scored
+    fail = dict(fail or {})
+
+    def score_func(symbol):
+        if crash_after is not None and len(calls) == crash_after:
+            raise Crash()
+        calls.append(symbol)
+        if symbol in fail:
+            raise fail.pop(symbol)
+        return {"RSI": 50.0}, 0.5
+
+    return score_func
+
+
+def test_resume_after_crash_skips_finished_symbols(tmp_path):
+    run_dir = str(tmp_path / "run")
+    calls = []
+    with pytest.raises(Crash):
+        run_batch(SYMBOLS, run_dir, shard_size=5, score_func=make_score_func(calls, crash_after=2))
+    assert calls == ["A", "B"]
+
+    # the crashed worker left its lock; age it past the timeout
+    os.utime(_shard_path(run_dir, 0, "lock"), (0, 0))
+    calls = []
+    status = run_batch(SYMBOLS, run_dir, shard_size=5, score_func=make_score_func(calls))
+    assert calls == ["C", "D", "E"]
+    assert status == {"shards": 1, "done": 1, "results": 5, "failures": 0}
+
+
+def test_append_jsonl_repairs_partial_last_line(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps({"symbol": "A"}) + "\n" + '{"symbol": "B", "sco')
+    _append_jsonl(path, {"symbol": "C"})
+    assert _read_jsonl(path) == [{"symbol": "A"}, {"symbol": "C"}]
+    with open(path) as f:
+        assert f.read().endswith("\n")
+
+
+def test_transient_failures_are_retried_and_permanent_ones_are_not(tmp_path):
+    run_dir = str(tmp_path / "run")
+    calls = []
+    score_func = make_score_func(calls, fail={"B": ConnectionError("reset"), "C": ValueError("no data")})
+    status = run_batch(SYMBOLS, run_dir, shard_size=5, score_func=score_func)
+    assert status["done"] == 0
+    assert status["failures"] == 2
+
+    calls.clear()
+    status = run_batch(SYMBOLS, run_dir, shard_size=5, score_func=score_func)
+    assert calls == ["B"]
+    assert status == {"shards": 1, "done": 1, "results": 4, "failures": 1}
+    _, failures = collect_results(run_dir)
+    assert failures["C"]["permanent"]
+
+
+def test_takeover_keeps_lock_replaced_after_stale_check(tmp_path, monkeypatch):
+    run_dir = str(tmp_path / "run")
+    batch_runner.create_run(run_dir, SYMBOLS, shard_size=5)
+    lock_path = _shard_path(run_dir, 0, "lock")
+    with open(lock_path, "w") as f:
+        f.write("other-host:1:stale")
+
+    def replaced_after_check(path, owner, lock_timeout):
+        # another worker takes the stale lock over between the check and the rename
+        os.remove(path)
+        with open(path, "w") as f:
+            f.write("other-host:2:fresh")
+        return True
+
+    monkeypatch.setattr(batch_runner, "_is_stale", replaced_after_check)
+    assert _claim_shard(run_dir, 0, lock_timeout=1800) is None
+    with open(lock_path) as f:
+        assert f.read() == "other-host:2:fresh"
+    assert os.listdir(os.path.dirname(lock_path)) == [os.path.basename(lock_path)]
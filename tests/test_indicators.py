@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.average_directional_index import average_directional_index
+from indicators.bollinger_bands import bollinger_bands, lower_bollinger_band, upper_bollinger_band
+from indicators.context import IndicatorContext
+from indicators.stochastic_rsi import relative_strength_index, stochastic_rsi
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(0)
+    n = 250
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + rng.random(n) * 2,
+            "Low": close - rng.random(n) * 2,
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, n),
+        },
+        index=pd.bdate_range("2024-01-01", periods=n, tz="Asia/Kolkata"),
+    )
+
+
+def reference_rsi(close, period=14):
+    # Loop formulation of relative_strength_index before vectorization
+    n = len(close)
+    change = np.r_[np.nan, np.diff(close)]
+    pos_change = np.where(change < 0, 0, change)
+    neg_change = np.abs(np.where(change > 0, 0, change))
+    avg_gain = pd.Series(pos_change).rolling(period, min_periods=period - 1).mean().to_numpy().copy()
+    avg_loss = pd.Series(neg_change).rolling(period, min_periods=period - 1).mean().to_numpy().copy()
+    for i in range(period + 1, n):
+        avg_gain[i] = (avg_gain[i - 1] * (period - 1) + pos_change[i]) / period
+        avg_loss[i] = (avg_loss[i - 1] * (period - 1) + neg_change[i]) / period
+    prev_gain = np.r_[np.nan, avg_gain[:-1]]
+    prev_loss = np.r_[np.nan, avg_loss[:-1]]
+    rs = ((prev_gain * (period - 1) + pos_change) / period) / (
+        (prev_loss * (period - 1) + neg_change) / period
+    )
+    rs[period - 1] = avg_gain[period - 1] / avg_loss[period - 1]
+    return 100 - (100 / (1 + rs))
+
+
+def reference_adx(high, low, close, period=14):
+    # Loop formulation of average_directional_index before vectorization
+    n = len(close)
+    prev_close = np.r_[np.nan, close[:-1]]
+    tr = np.round(np.nanmax(np.c_[high - low, abs(high - prev_close), abs(low - prev_close)], axis=1), 3)
+    up = np.r_[np.nan, np.diff(high)]
+    down = np.r_[np.nan, -np.diff(low)]
+    pos_dm = np.round([max(up[i], 0) if up[i] > down[i] else 0 for i in range(n)], 3)
+    neg_dm = np.round([max(down[i], 0) if down[i] > up[i] else 0 for i in range(n)], 3)
+
+    def wilder_sum(x):
+        s = np.full(n, np.nan)
+        s[period] = x[: period + 1].sum()
+        for i in range(period + 1, n):
+            s[i] = s[i - 1] - s[i - 1] / period + x[i]
+        return s
+
+    tr14, pos14, neg14 = wilder_sum(tr), wilder_sum(pos_dm), wilder_sum(neg_dm)
+    pos_di, neg_di = pos14 / tr14 * 100, neg14 / tr14 * 100
+    dx = abs(pos_di - neg_di) / abs(pos_di + neg_di) * 100
+    adx = np.full(n, np.nan)
+    start = 2 * period - 1
+    adx[start] = np.nanmean(dx[period - 1 : start])
+    for i in range(start + 1, n):
+        adx[i] = (adx[i - 1] * (period - 1) + dx[i]) / period
+    return adx
+
+
+def reference_bands(close, period=20, std_mult=2.0):
+    # Loop formulation of the upper and lower Bollinger bands before vectorization
+    sma = pd.Series(close).rolling(period).mean().to_numpy().copy()
+    upper, lower = np.full(len(close), np.nan), np.full(len(close), np.nan)
+    for i in range(period - 1, len(close)):
+        std_dev = np.std(close[i - period + 1 : i + 1])
+        upper[i] = sma[i] + std_dev * std_mult
+        lower[i] = sma[i] - std_dev * std_mult
+    return upper, lower
+
+
+def test_rsi_matches_loop_reference(history):
+    rsi = relative_strength_index(history.copy())["RSI"].to_numpy()
+    np.testing.assert_allclose(rsi, reference_rsi(history["Close"].to_numpy()), rtol=1e-12, atol=1e-12)
+
+
+def test_adx_matches_loop_reference(history):
+    adx = average_directional_index(history.copy())["ADX"].to_numpy()
+    expected = reference_adx(*(history[c].to_numpy() for c in ("High", "Low", "Close")))
+    np.testing.assert_allclose(adx, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_bollinger_bands_match_loop_reference(history):
+    df = bollinger_bands(history.copy())
+    upper, lower = reference_bands(history["Close"].to_numpy())
+    np.testing.assert_allclose(df["BB_UPPER"].to_numpy(), upper, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(df["BB_LOWER"].to_numpy(), lower, rtol=1e-12, atol=1e-12)
+
+
+def test_stochastic_rsi_recomputed_on_shared_context(history):
+    df = history.copy()
+    ctx = IndicatorContext(df)
+    stochastic_rsi(df, period=14, ctx=ctx)
+    df = stochastic_rsi(df, period=7, ctx=ctx)
+    expected = stochastic_rsi(history.copy(), period=7)
+    k = df["RSI_FAST_K"].dropna()
+    assert k.between(0, 100).all()
+    np.testing.assert_allclose(df["RSI_FAST_K"], expected["RSI_FAST_K"])
+
+
+def test_bollinger_band_with_context_uses_given_series(history):
+    ctx = IndicatorContext(history)
+    tail = history.Close.iloc[-100:]
+    np.testing.assert_allclose(upper_bollinger_band(tail, 20, ctx=ctx), upper_bollinger_band(tail, 20))
+    unnamed = history.Close.rename(None) * 2
+    np.testing.assert_allclose(lower_bollinger_band(unnamed, 20, ctx=ctx), lower_bollinger_band(unnamed, 20))
+    assert ctx.source_column(history.Close) == "Close"
+    assert ctx.source_column(tail) is None
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.scores import SCORING_CRITERIA, score_using_criteria
+from src.weight_sweep import MAX_VAL, MIN_VAL, sample_criteria, score_cube
+
+
+def test_score_cube_matches_score_using_criteria():
+    rng = np.random.default_rng(0)
+    metric_names, params = sample_criteria(6, seed=0)
+    # an inverted range and an equal min/max, where dynamic_score is a step
+    params[1, 0, [MIN_VAL, MAX_VAL]] = (10, 0)
+    params[2, 1, [MIN_VAL, MAX_VAL]] = (5, 5)
+
+    span = np.array([SCORING_CRITERIA[m][:2] for m in metric_names], dtype=float)
+    low, high = span.min(axis=1), span.max(axis=1)
+    width = np.maximum(high - low, 1)
+    cube = rng.uniform(low - width, high + width, (4, 5, len(metric_names)))
+    cube[0, 0, 1] = 5  # on the equal min/max
+    cube[rng.random(cube.shape) < 0.2] = np.nan
+    cube[1, 2] = np.nan  # no metrics at all
+
+    scores = score_cube(params, cube)
+
+    for c, config in enumerate(params):
+        criteria = {m: (lo, hi, bool(better), w) for m, (lo, hi, better, w) in zip(metric_names, config)}
+        for d in range(cube.shape[0]):
+            for s in range(cube.shape[1]):
+                metrics = {m: v for m, v in zip(metric_names, cube[d, s]) if not np.isnan(v)}
+                expected = score_using_criteria(metrics, criteria, calculate_weight=True)
+                assert abs(scores[c, d, s] - expected) < 1e-12